@@ -2,11 +2,16 @@ import math
 from typing import Final, Optional
 
 import numpy
+from optimizer._internals.pcg.precondition import hessian_precon
+from overloads.shortcuts import assertNoInfNaN
 from overloads.typing import ndarray
 
 
 class Hessian:
     value: Final[ndarray]
+    eigval: Final[ndarray]
+    eigvec: Final[ndarray]
+    precon: Final[ndarray]
     ill: Final[bool]
     pinv: Final[Optional[ndarray]] = None
     times: int = 0
@@ -15,19 +20,30 @@ class Hessian:
     def __init__(self, value: ndarray, *, max_times: int) -> None:
         _err = math.sqrt(float(numpy.finfo(numpy.float64).eps))
 
-        value = (value.T + value) / 2.0  # type: ignore
+        value = numpy.ascontiguousarray((value.T + value) / 2.0)
+        assertNoInfNaN(value)
 
-        e: ndarray = numpy.linalg.eig(value)[0]  # type: ignore
-        if e.dtype.type != numpy.float64:
-            e = e.real
+        # 对称矩阵的特征分解 H = Q @ diag(e) @ Q.T，在整个shaking周期内复用
+        e: ndarray
+        Q: ndarray
+        e, Q = numpy.linalg.eigh(value)  # type: ignore
         assert e.dtype.type == numpy.float64
 
         min_e = float(e.min())
 
         self.value = value
+        self.eigval = e
+        self.eigvec = Q
+        # PCG的对角预条件子只依赖H，在整个shaking周期内复用
+        self.precon = hessian_precon(value)
         self.ill = min_e < _err
 
         if self.ill:
-            self.pinv = numpy.linalg.pinv(value)  # type: ignore
+            # 与numpy.linalg.pinv相同的截断准则，奇异值即|e|
+            abs_e: ndarray = numpy.abs(e)
+            cutoff = 1e-15 * float(abs_e.max())
+            inv_e = numpy.zeros(e.shape)
+            inv_e[abs_e > cutoff] = 1.0 / e[abs_e > cutoff]
+            self.pinv = (Q * inv_e) @ Q.T  # type: ignore
 
         self.max_times = max_times
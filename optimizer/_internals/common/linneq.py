@@ -111,8 +111,7 @@ def margin(
         => h == (b - A @ theta)/A[:, i]
         """
         residual: ndarray = b - A @ theta  # (nConst, )
-        residual.shape = (A.shape[0], 1)  # (nConst, 1)
-        h: ndarray = residual / A  # (nConst, n)
+        h: ndarray = residual[:, numpy.newaxis] / A  # (nConst, 1) / (nConst, n)
         """
         lb: 所有负数里面取最大
         ub: 所有正数里面取最小
@@ -0,0 +1,82 @@
+import math
+from typing import Tuple
+
+import numpy
+from optimizer._internals.pcg.flag import Flag
+from optimizer._internals.pcg.norm_l2 import norm_l2
+from overloads.typing import ndarray
+
+_sqrt_eps: float = math.sqrt(float(numpy.finfo(numpy.float64).eps))
+_max_iter: int = 100
+_rtol: float = 1e-8
+
+
+def exact_trs(
+    g: ndarray, e: ndarray, Q: ndarray, delta: float
+) -> Tuple[ndarray, Flag]:
+    """
+    利用H的特征分解 H = Q @ diag(e) @ Q.T (e升序) 精确求解信赖域子问题
+        min g @ h + 0.5 * (h @ H @ h)  s.t. ||h|| <= delta
+    最优解满足 (H + lam*I) @ h == -g, lam >= max(0, -e[0]), lam*(||h||-delta) == 0
+
+    在特征基下 h(lam) = Q @ (c / (e + lam))，其中 c = -Q.T @ g
+    ||h(lam)||^2 = sum(c*c / (e+lam)^2)，每次求值只需O(n)
+
+    Moré–Sorensen：对 phi(lam) = 1/||h(lam)|| - 1/delta 做Newton迭代
+        lam <- lam + (||h||^2 / sum(c*c / (e+lam)^3)) * (||h||/delta - 1)
+    phi在(-e[0], inf)上单调递增且为凹函数，从左侧出发的Newton迭代单调收敛
+    Newton步越出括号区间[lo, hi]时退化为二分
+
+    flag与PCG的退出原因对应：信赖域内部的Newton步为RESIDUAL_CONVERGENCE，
+    H非正定时为NEGATIVE_CURVATURE，其余落在信赖域边界上的为OUT_OF_TRUST_REGION
+    """
+    c: ndarray = -(Q.T @ g)
+    lo = max(0.0, -float(e[0]))
+    # 在 lam == hi 处 e+lam >= ||g||/delta，因此 ||h(hi)|| <= delta
+    hi = lo + norm_l2(g) / delta
+
+    # hard case：H非正定且最小特征值对应的梯度分量为0，||h(lam)||在lo处没有极点
+    # H正定时lo == 0，不存在极点，Newton步的每个分量都要保留
+    # 两个判据都取相对量，否则 ||g|| 或 H 的尺度很小时会误判为hard case
+    near: ndarray = e - e[0] <= _sqrt_eps * float(numpy.abs(e).max())
+    if e[0] <= 0 and norm_l2(c[near]) <= _sqrt_eps * norm_l2(c):
+        y = numpy.zeros(e.shape)
+        y[~near] = c[~near] / (e[~near] + lo)
+        size = norm_l2(y)
+        if size <= delta:
+            if lo > 0:
+                # 沿最小特征向量补足到信赖域边界
+                y[0] = math.sqrt(delta * delta - size * size)
+                return Q @ y, Flag.NEGATIVE_CURVATURE
+            return Q @ y, Flag.RESIDUAL_CONVERGENCE
+
+    lam = lo
+    y = numpy.zeros(e.shape)
+    for _ in range(_max_iter):
+        d: ndarray = e + lam
+        if float(d.min()) > 0:
+            y = c / d
+            size = norm_l2(y)
+            if lam == 0 and size <= delta:
+                return Q @ y, Flag.RESIDUAL_CONVERGENCE  # 信赖域内部的Newton步
+            if math.fabs(size - delta) <= _rtol * delta:
+                break
+            if size > delta:
+                lo = lam
+            else:
+                hi = lam
+            t = float((y * y) @ (1.0 / d))
+            lam_new = lam + (size * size / t) * (size / delta - 1.0)
+        else:
+            lam_new = lo  # 奇异点处没有定义，交给二分
+        if not lo < lam_new < hi:
+            lam_new = (lo + hi) / 2.0
+        lam = lam_new
+
+    # 收敛容差之内的微小越界直接缩放回信赖域
+    size = norm_l2(y)
+    if size > delta:
+        y = y * (delta / size)
+    if e[0] < 0:
+        return Q @ y, Flag.NEGATIVE_CURVATURE
+    return Q @ y, Flag.OUT_OF_TRUST_REGION
@@ -0,0 +1,158 @@
+import math
+from typing import Tuple
+
+import numba  # type: ignore
+import numpy
+from optimizer._internals.pcg.flag import Flag
+from overloads.typing import ndarray
+
+"""
+PCG主循环的编译内核
+签名中的 float64[::1] / float64[:, ::1] 要求C连续数组，导入时即完成编译(并缓存到磁盘)
+调用方负责保证输入连续，并把返回的int8退出码映射回Flag
+返回的残差满足 r == -g - H @ x，调用方可据此免去一次 H @ x
+"""
+
+_sqrt_eps: float = math.sqrt(float(numpy.finfo(numpy.float64).eps))
+
+_RESIDUAL_CONVERGENCE: int = Flag.RESIDUAL_CONVERGENCE.value
+_NEGATIVE_CURVATURE: int = Flag.NEGATIVE_CURVATURE.value
+_OUT_OF_TRUST_REGION: int = Flag.OUT_OF_TRUST_REGION.value
+_VIOLATE_CONSTRAINTS: int = Flag.VIOLATE_CONSTRAINTS.value
+
+
+# lb/ub中允许出现inf，因此fastmath不能开启nnan与ninf
+_fastmath = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@numba.njit(
+    "float64(float64[:, ::1], float64[::1], float64[::1])",
+    cache=True,
+    fastmath=_fastmath,
+)
+def _symv_dot(H: ndarray, d: ndarray, ww: ndarray) -> float:
+    """
+    利用H的对称性，只读取上三角求出 ww = H @ d（原地写入ww），并顺带返回 d @ ww
+    第i行处理完毕后ww[i]不再变化，因此内积可以在同一趟循环内累加
+    """
+    (n,) = d.shape
+    ww[:] = 0.0
+    denom = 0.0
+    for i in range(n):
+        s = H[i, i] * d[i]
+        for j in range(i + 1, n):
+            s += H[i, j] * d[j]
+            ww[j] += H[i, j] * d[i]
+        ww[i] += s
+        denom += d[i] * ww[i]
+    return denom
+
+
+@numba.njit(
+    "Tuple((float64[::1], float64[::1], float64[::1], int64, int8))("
+    "float64[::1], float64[:, ::1], float64[::1], "
+    "float64[:, ::1], float64[::1], float64[::1], float64[::1], float64)",
+    cache=True,
+    fastmath=_fastmath,
+)
+def pcg_kernel(
+    g: ndarray,
+    H: ndarray,
+    R: ndarray,
+    A: ndarray,
+    b: ndarray,
+    lb: ndarray,
+    ub: ndarray,
+    delta: float,
+) -> Tuple[ndarray, ndarray, ndarray, int, numpy.int8]:
+    (n,) = g.shape
+    (m,) = b.shape
+
+    # 全部工作数组在入口处一次性分配，循环内只做原地更新
+    x = numpy.zeros((n,))  # 目标点
+    x_new = numpy.empty((n,))  # 试探点
+    r = numpy.empty((n,))  # 残差
+    z = numpy.empty((n,))  # 归一化后的残差
+    d = numpy.empty((n,))  # 搜索方向
+    d_new = numpy.empty((n,))
+    ww = numpy.empty((n,))  # H @ d
+    Ax = numpy.zeros((m,))  # A @ x
+    Ad = numpy.empty((m,))  # A @ d
+
+    inner1 = 0.0
+    z_max = 0.0
+    for i in range(n):
+        r[i] = -g[i]
+        z[i] = r[i] / R[i]
+        d[i] = z[i]
+        inner1 += r[i] * z[i]
+        z_max = max(z_max, abs(z[i]))
+
+    for k in range(m):
+        Ad[k] = numpy.dot(A[k, :], d)
+
+    # ||x||^2、x @ d、d @ d 的递推量，用于免开方地检查信赖域
+    x_dot_x = 0.0
+    x_dot_d = 0.0
+    d_dot_d = numpy.dot(d, d)
+
+    for iter in range(n):
+        # 残差收敛性检查
+        if z_max < _sqrt_eps:
+            return x, d, r, iter, numpy.int8(_RESIDUAL_CONVERGENCE)
+
+        # 负曲率检查
+        denom = _symv_dot(H, d, ww)
+        if denom <= 0:
+            return x, d, r, iter, numpy.int8(_NEGATIVE_CURVATURE)
+
+        # 试探坐标点
+        alpha = inner1 / denom
+
+        # 目标点超出信赖域
+        # ||x + alpha*d||^2 == x@x + 2*alpha*(x@d) + alpha^2*(d@d)
+        x_dot_x_new = x_dot_x + 2.0 * alpha * x_dot_d + alpha * alpha * d_dot_d
+        if x_dot_x_new > delta * delta:
+            return x, d, r, iter, numpy.int8(_OUT_OF_TRUST_REGION)
+
+        # 违反约束
+        # 试探点的生成与上下界检查合并为一趟无分支的循环，便于编译器向量化
+        feasible = True
+        for i in range(n):
+            x_new[i] = x[i] + alpha * d[i]
+            feasible &= (lb[i] <= x_new[i]) & (x_new[i] <= ub[i])
+        # A @ x_new == A @ x + alpha * (A @ d)，只需O(m)
+        for k in range(m):
+            feasible &= Ax[k] + alpha * Ad[k] <= b[k]
+        if not feasible:
+            return x, d, r, iter, numpy.int8(_VIOLATE_CONSTRAINTS)
+
+        # 更新坐标点
+        x, x_new = x_new, x
+        x_dot_x = x_dot_x_new
+        for k in range(m):
+            Ax[k] += alpha * Ad[k]
+
+        # 更新残差
+        inner2 = inner1
+        inner1 = 0.0
+        z_max = 0.0
+        for i in range(n):
+            r[i] -= alpha * ww[i]
+            z[i] = r[i] / R[i]
+            inner1 += r[i] * z[i]
+            z_max = max(z_max, abs(z[i]))
+
+        # 更新搜索方向
+        beta = inner1 / inner2
+        x_dot_d = 0.0
+        d_dot_d = 0.0
+        for i in range(n):
+            d_new[i] = z[i] + beta * d[i]
+            x_dot_d += x[i] * d_new[i]
+            d_dot_d += d_new[i] * d_new[i]
+        d, d_new = d_new, d
+        for k in range(m):
+            Ad[k] = numpy.dot(A[k, :], d)
+
+    return x, d, r, n - 1, numpy.int8(_RESIDUAL_CONVERGENCE)
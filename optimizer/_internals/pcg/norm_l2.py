@@ -1,7 +1,7 @@
-import math
-
 from overloads.typing import ndarray
+from scipy.linalg.blas import dnrm2  # type: ignore
 
 
 def norm_l2(x: ndarray) -> float:
-    return math.sqrt(float(x @ x))
+    # 单次BLAS调用，内部做了缩放，x @ x 溢出时也能得到正确的范数
+    return dnrm2(x)  # type: ignore
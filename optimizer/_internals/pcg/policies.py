@@ -1,5 +1,5 @@
 import math
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy
 from optimizer._internals.common.linneq import check, margin
@@ -45,18 +45,19 @@ def subspace_decay(
     _d: ndarray,
     _delta: float,
     constraints: Tuple[ndarray, ndarray, ndarray, ndarray],
+    *,
+    Hx: Optional[ndarray] = None,
 ) -> Status:
-
     _x = _status.x
 
-    # scale patch
-    g = _g if _x is None else _g + H @ _x
+    # scale patch，调用方已知 Hx == H @ _x 时省去一次矩阵向量乘
+    g = _g if _x is None else _g + (H @ _x if Hx is None else Hx)
 
     # 勾股定理求出内接于大圆信赖域的、以base为圆心的小圆信赖域半径
     delta = _delta if _x is None else _delta - norm_l2(_x)
 
     # 如果小圆信赖域太小，或前进方向异常，直接返回，啥也不做
-    if delta <= 0 or norm_l2(_d) <= 0:
+    if delta <= 0 or not _d.any():
         return _status
 
     # 使用精确的二次型方法确定最优缩放尺度
@@ -79,18 +80,20 @@ def subspace_decay(
         if numpy.all(numpy.logical_and(lb <= d, d <= ub)):
             break
         # 如果全部都越界，也退出折半衰减
-        if numpy.all(eliminated):
+        if eliminated.all():
             break
 
     final_x = d if _x is None else _x + d
 
     # 如果折半衰减后不满足约束，放弃，返回None
     if not check(final_x, constraints):
-        return Status(None, _status.iter, Flag.VIOLATE_CONSTRAINTS, _delta, _g, H)
+        return Status.make(None, _status.iter, Flag.VIOLATE_CONSTRAINTS, _delta, _g, H)
 
     # 如果满足了约束，曾经衰减过，那么替换flag为“越界”
-    if bool(numpy.any(eliminated)):
-        return Status(final_x, _status.iter, Flag.VIOLATE_CONSTRAINTS, _delta, _g, H)
+    if eliminated.any():
+        return Status.make(
+            final_x, _status.iter, Flag.VIOLATE_CONSTRAINTS, _delta, _g, H
+        )
 
     # 否则返回预期的前进
-    return Status(final_x, _status.iter, _status.flag, _delta, _g, H)
+    return Status.make(final_x, _status.iter, _status.flag, _delta, _g, H)
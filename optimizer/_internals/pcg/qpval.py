@@ -1,12 +1,17 @@
+from typing import Optional
+
 from overloads.shortcuts import assertNoInfNaN_float
 from overloads.typing import ndarray
 
 
-def qpval(*, g: ndarray, H: ndarray, x: ndarray) -> float:
+def qpval(
+    *, g: ndarray, H: ndarray, x: ndarray, Hx: Optional[ndarray] = None
+) -> float:
     assert len(g.shape) == 1
     assert len(H.shape) == 2
     assert len(x.shape) == 1
     assert g.shape[0] == H.shape[0] == H.shape[1] == x.shape[0]
-    value = float(g @ x) + 0.5 * float(x @ H @ x)
+    # 调用方已知 H @ x 时只需两次内积
+    value = float(g @ x) + 0.5 * float(x @ (H @ x if Hx is None else Hx))
     assertNoInfNaN_float(value)
     return value
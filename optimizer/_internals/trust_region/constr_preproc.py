@@ -26,4 +26,5 @@ def constr_preproc(
     # 行去重
     Ab: ndarray = numpy.unique(Ab, axis=0)  # type: ignore
 
-    return (Ab[:, :-1], Ab[:, -1], lb, ub)
+    # 切片得到的A不是C连续的，这里一次性拷贝，避免此后每次矩阵乘法都隐式复制
+    return (numpy.ascontiguousarray(Ab[:, :-1]), Ab[:, -1].copy(), lb, ub)
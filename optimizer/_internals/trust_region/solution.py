@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
-from typing import Final, Tuple
+from typing import Final, Optional, Tuple
 
 from optimizer._internals.common.findiff import findiff
 from optimizer._internals.common.gradient import Gradient
@@ -16,8 +16,9 @@ class Solution:
     fval: Final[float]
     x: Final[ndarray]
     grad: Final[Gradient]
-    shifted_constr: Final[Tuple[ndarray, ndarray, ndarray, ndarray]]
     hess_up_to_date: bool = False
+    _shifted_constr: Optional[Tuple[ndarray, ndarray, ndarray, ndarray]] = None
+    _hessian: Optional[Hessian] = None
 
     def __init__(
         self,
@@ -36,10 +37,20 @@ class Solution:
             state.opts,
             check=GradientCheck(state.f_np, iter, *g_infnorm),
         )
-        A, b, lb, ub = state.constraints
-        self.shifted_constr = (A, b - A @ x, lb - x, ub - x)
+
+    @property
+    def shifted_constr(self) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        # 只有被接受的点才会作为PCG的起点，被拒绝的试探点无需计算 A @ x
+        if self._shifted_constr is None:
+            A, b, lb, ub = self.state.constraints
+            x = self.x
+            self._shifted_constr = (A, b - A @ x, lb - x, ub - x)
+        return self._shifted_constr
 
     def get_hessian(self) -> Hessian:
+        # 有限差分hessian需要n次梯度调用，同一个点上只采样一次
+        if self._hessian is not None:
+            return self._hessian
         self.hess_up_to_date = True
         H = findiff(
             lambda x: make_gradient(
@@ -48,9 +59,10 @@ class Solution:
             self.x,
             self.state.constraints,
         )
-        return Hessian(
+        self._hessian = Hessian(
             H,
             max_times=self.x.shape[0]
             if self.state.opts.shaking == "x.shape[0]"
             else self.state.opts.shaking,
         )
+        return self._hessian
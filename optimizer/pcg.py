@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
-from typing import Optional, Tuple, cast
+from typing import Optional, Tuple
 
 import numpy
 from overloads import bind_checker, dyn_typing
@@ -11,8 +11,10 @@ from overloads.typing import ndarray
 from optimizer._internals.common.hessian import Hessian
 from optimizer._internals.common.linneq import check, constraint_check
 from optimizer._internals.pcg import flag, status
+from optimizer._internals.pcg.exact_trs import exact_trs
+from optimizer._internals.pcg.kernel import pcg_kernel
 from optimizer._internals.pcg.policies import subspace_decay
-from optimizer._internals.pcg.precondition import gradient_precon, hessian_precon
+from optimizer._internals.pcg.precondition import gradient_precon
 
 Flag = flag.Flag
 Status = status.Status
@@ -27,16 +29,16 @@ def _impl_input_check(
         float,
     ]
 ) -> None:
-    g, H, R, constraints, delta = input
+    g, _, R, constraints, delta = input
     assertNoInfNaN(g)
-    assertNoInfNaN(H)
+    # H的inf/nan检查在构造Hessian时进行，每个H只需O(n^2)扫描一次
     assertNoInfNaN(R)
     constraint_check(constraints)
     assertNoInfNaN_float(delta)
 
 
-def _impl_output_check(output: Tuple[Status, Optional[ndarray]]) -> None:
-    status, direct = output
+def _impl_output_check(output: Tuple[Status, Optional[ndarray], ndarray]) -> None:
+    status, direct, _ = output
     if status.flag == Flag.RESIDUAL_CONVERGENCE:
         assert direct is None
     else:
@@ -44,69 +46,32 @@ def _impl_output_check(output: Tuple[Status, Optional[ndarray]]) -> None:
         assertNoInfNaN(direct)
 
 
-@bind_checker.bind_checker_5(input=_impl_input_check, output=_impl_output_check)
 def _implimentation(
     g: ndarray,
     H: ndarray,
     R: ndarray,
     constraints: Tuple[ndarray, ndarray, ndarray, ndarray],
     delta: float,
-) -> Tuple[Status, Optional[ndarray]]:
-    def exit_(
-        x: ndarray, d: Optional[ndarray], iter: int, flag: Flag
-    ) -> Tuple[Status, Optional[ndarray]]:
-        if iter != 0 or flag == Flag.RESIDUAL_CONVERGENCE:
-            return Status(x, iter, flag, delta, g, H), d
-        else:
-            return Status(None, iter, flag, delta, g, H), d
-
-    _eps = float(numpy.finfo(numpy.float64).eps)
-
-    (n,) = g.shape
-    x: ndarray = numpy.zeros((n,))  # 目标点
-    r: ndarray = -g  # 残差
-    z: ndarray = r / R  # 归一化后的残差
-    d: ndarray = z  # 搜索方向
-
-    inner1: float = float(r.T @ z)
-
-    for iter in range(n):
-        # 残差收敛性检查
-        if numpy.abs(z).max() < numpy.sqrt(_eps):
-            return exit_(x, None, iter, Flag.RESIDUAL_CONVERGENCE)
-
-        # 负曲率检查
-        ww: ndarray = H @ d
-        denom: float = float(d.T @ ww)
-        if denom <= 0:
-            return exit_(x, d, iter, Flag.NEGATIVE_CURVATURE)
-
-        # 试探坐标点
-        alpha: float = inner1 / denom
-        x_new: ndarray = x + alpha * d
-
-        # 目标点超出信赖域
-        if numpy.linalg.norm(x_new) > delta:  # type: ignore
-            return exit_(x, d, iter, Flag.OUT_OF_TRUST_REGION)
-
-        # 违反约束
-        if not check(x_new, constraints):
-            return exit_(x, d, iter, Flag.VIOLATE_CONSTRAINTS)
-
-        # 更新坐标点
-        x = x_new
-
-        # 更新残差
-        r = cast(ndarray, r - alpha * ww)
-        z = cast(ndarray, r / R)
-
-        # 更新搜索方向
-        inner2: float = inner1
-        inner1 = float(r.T @ z)
-        beta: float = inner1 / inner2
-        d = z + beta * d
-
-    return exit_(x, None, iter, Flag.RESIDUAL_CONVERGENCE)
+) -> Tuple[Status, Optional[ndarray], ndarray]:
+    # 热点路径：输入输出检查只在__debug__下进行，python -O 时整段被剔除
+    if __debug__:
+        _impl_input_check((g, H, R, constraints, delta))
+    A, b, lb, ub = constraints
+    # 编译好的内核只接受C连续的float64数组，由pcg入口保证
+    x, d, r, iter, code = pcg_kernel(g, H, R, A, b, lb, ub, float(delta))
+    flag = Flag(int(code))
+    # 残差 r == -g - H @ x，直接得到 H @ x
+    Hx: ndarray = -(g + r)
+    output: Tuple[Status, Optional[ndarray], ndarray]
+    if flag == Flag.RESIDUAL_CONVERGENCE:
+        output = Status.make(x, iter, flag, delta, g, H, Hx=Hx), None, Hx
+    elif iter != 0:
+        output = Status.make(x, iter, flag, delta, g, H, Hx=Hx), d, Hx
+    else:
+        output = Status.make(None, iter, flag, delta, g, H), d, Hx
+    if __debug__:
+        _impl_output_check(output)
+    return output
 
 
 def _pcg_input_check(
@@ -127,6 +92,10 @@ def _pcg_output_check(output: Status) -> None:
         assert output.fval is None
 
 
+# 维度不超过此值时，先用特征分解精确求解信赖域子问题
+# 解是信赖域内部的Newton步且满足约束时，PCG最终也收敛到这一点，直接取代PCG
+_exact_trs_max_n: int = 200
+
 N = dyn_typing.SizeVar()
 nConstraints = dyn_typing.SizeVar()
 
@@ -155,22 +124,69 @@ def pcg(
     delta: float,
 ) -> Status:
 
+    # 入口处一次性保证C连续(H.value在构造Hessian时已保证)，之后不再逐次复制
+    g = numpy.ascontiguousarray(g)
+    A, b, lb, ub = constraints
+    constraints = (
+        numpy.ascontiguousarray(A),
+        numpy.ascontiguousarray(b),
+        numpy.ascontiguousarray(lb),
+        numpy.ascontiguousarray(ub),
+    )
+
+    if g.shape[0] <= _exact_trs_max_n:
+        ret0 = _exact_trs_policy(g, H, constraints, delta)
+        if ret0 is not None:
+            return ret0
+
+    ret1 = _best_policy(g, H.value, H.precon, constraints, delta)
+    # 梯度预条件只作为后备：Hessian预条件的PCG已在域内收敛时无需再跑一遍
+    ret2 = (
+        None
+        if ret1.x is not None and ret1.flag == Flag.RESIDUAL_CONVERGENCE
+        else _best_policy(g, H.value, gradient_precon(g), constraints, delta)
+    )
     return status.best_status(
-        _best_policy(g, H.value, hessian_precon(H.value), constraints, delta),
-        _best_policy(g, H.value, gradient_precon(g), constraints, delta),
-        subspace_decay(
-            g,
-            H.value,
-            Status(None, 0, Flag.POLICY_ONLY, delta, g, H.value),
-            numpy.linalg.solve(H.value, -g)  # type: ignore
-            if H.pinv is None
-            else H.pinv @ (-g),
-            delta,
-            constraints,
-        ),
+        ret1,
+        ret2,
+        _newton_policy(g, H, constraints, delta),
     )
 
 
+def _newton_policy(
+    g: ndarray,
+    H: Hessian,
+    constraints: Tuple[ndarray, ndarray, ndarray, ndarray],
+    delta: float,
+) -> Status:
+    return subspace_decay(
+        g,
+        H.value,
+        Status.make(None, 0, Flag.POLICY_ONLY, delta, g, H.value),
+        H.eigvec @ ((H.eigvec.T @ (-g)) / H.eigval)
+        if H.pinv is None
+        else H.pinv @ (-g),
+        delta,
+        constraints,
+    )
+
+
+def _exact_trs_policy(
+    g: ndarray,
+    H: Hessian,
+    constraints: Tuple[ndarray, ndarray, ndarray, ndarray],
+    delta: float,
+) -> Optional[Status]:
+    """
+    只接受信赖域内部且满足约束的解，否则返回None，交给PCG与子空间衰减处理
+    落在信赖域边界上的精确解虽然二次模型值更低，但会改变trust_region的迭代路径
+    """
+    x, flag = exact_trs(g, H.eigval, H.eigvec, delta)
+    if flag != Flag.RESIDUAL_CONVERGENCE or not check(x, constraints):
+        return None
+    return Status.make(x, 0, flag, delta, g, H.value)
+
+
 def _best_policy(
     g: ndarray,
     H: ndarray,
@@ -182,16 +198,16 @@ def _best_policy(
     ret0 = subspace_decay(
         g,
         H,
-        Status(None, 0, Flag.POLICY_ONLY, delta, g, H),
+        Status.make(None, 0, Flag.POLICY_ONLY, delta, g, H),
         (-g) / R,
         delta,
         constraints,
     )
-    ret1, direct = _implimentation(g, H, R, constraints, delta)
+    ret1, direct, Hx = _implimentation(g, H, R, constraints, delta)
     if ret1.flag == Flag.RESIDUAL_CONVERGENCE:
         assert direct is None
         ret2 = None
     else:
         assert direct is not None
-        ret2 = subspace_decay(g, H, ret1, direct, delta, constraints)
+        ret2 = subspace_decay(g, H, ret1, direct, delta, constraints, Hx=Hx)
     return status.best_status(ret1, ret2, ret0)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import numpy
+from optimizer._internals.pcg.exact_trs import exact_trs
+from optimizer._internals.pcg.flag import Flag
+from overloads.typing import ndarray
+
+
+def check_optimality(g: ndarray, H: ndarray, delta: float, h: ndarray) -> None:
+    """
+    信赖域子问题的全局最优性条件：
+    (H + lam*I) @ h == -g, lam >= 0, H + lam*I 半正定, lam*(||h||-delta) == 0
+    """
+    size = float(numpy.linalg.norm(h))
+    assert size <= delta * (1.0 + 1e-6)
+    lam = 0.0
+    if size >= delta * (1.0 - 1e-6):
+        lam = -float(h @ (H @ h + g)) / (size * size)
+    assert lam >= -1e-8
+    assert numpy.linalg.eigvalsh(H + lam * numpy.eye(H.shape[0])).min() >= -1e-6
+    residual = float(numpy.abs(H @ h + lam * h + g).max())
+    assert residual <= 1e-6 * max(1.0, float(numpy.abs(g).max()))
+
+
+def solve(g: ndarray, H: ndarray, delta: float) -> ndarray:
+    e, Q = numpy.linalg.eigh(H)
+    h, _ = exact_trs(g, e, Q, delta)
+    return h
+
+
+class Test_exact_trs:
+    def test_interior(self) -> None:
+        H = numpy.array([[2.0, 1.0], [1.0, 3.0]])
+        g = numpy.array([0.1, -0.2])
+        h = solve(g, H, 10.0)
+        assert numpy.abs(h - numpy.linalg.solve(H, -g)).max() < 1e-12
+        check_optimality(g, H, 10.0, h)
+
+    def test_boundary(self) -> None:
+        H = numpy.array([[2.0, 1.0], [1.0, 3.0]])
+        g = numpy.array([10.0, -20.0])
+        h = solve(g, H, 1.0)
+        assert abs(numpy.linalg.norm(h) - 1.0) < 1e-6
+        check_optimality(g, H, 1.0, h)
+
+    def test_indefinite(self) -> None:
+        rng = numpy.random.RandomState(0)
+        for n in (1, 3, 10, 50):
+            M = rng.randn(n, n)
+            H = (M + M.T) / 2.0
+            g = rng.randn(n)
+            for delta in (1e-3, 1.0, 1e3):
+                check_optimality(g, H, delta, solve(g, H, delta))
+
+    def test_hard_case(self) -> None:
+        H = numpy.diag([-1.0, 2.0, 3.0])
+        g = numpy.array([0.0, 1.0, 1.0])
+        h = solve(g, H, 2.0)
+        assert abs(numpy.linalg.norm(h) - 2.0) < 1e-6
+        check_optimality(g, H, 2.0, h)
+
+    def test_flag(self) -> None:
+        H = numpy.array([[2.0, 1.0], [1.0, 3.0]])
+        e, Q = numpy.linalg.eigh(H)
+        _, flag = exact_trs(numpy.array([0.1, -0.2]), e, Q, 10.0)
+        assert flag == Flag.RESIDUAL_CONVERGENCE
+        _, flag = exact_trs(numpy.array([10.0, -20.0]), e, Q, 1.0)
+        assert flag == Flag.OUT_OF_TRUST_REGION
+        e, Q = numpy.linalg.eigh(numpy.diag([-1.0, 2.0, 3.0]))
+        for g in (numpy.array([1.0, 1.0, 1.0]), numpy.array([0.0, 1.0, 1.0])):
+            _, flag = exact_trs(g, e, Q, 2.0)
+            assert flag == Flag.NEGATIVE_CURVATURE
+
+    def test_positive_definite_small_component(self) -> None:
+        # H正定时即使某个梯度分量相对很小也不是hard case
+        H = numpy.diag([1e-7, 1.0])
+        g = numpy.array([1.4e-8, 1.0])
+        h = solve(g, H, 10.0)
+        newton = numpy.linalg.solve(H, -g)
+        assert numpy.abs(h - newton).max() <= 1e-8 * numpy.abs(newton).max()
+        check_optimality(g, H, 10.0, h)
+
+    def test_tiny_gradient(self) -> None:
+        # 接近收敛时 ||g|| 很小，仍应得到精确的牛顿步
+        for H, g in (
+            (numpy.diag([1e-3, 1.0]), numpy.array([1e-9, 1e-9])),
+            (numpy.array([[2.0, 1.0], [1.0, 3.0]]), numpy.array([1e-9, -1e-9])),
+        ):
+            h = solve(g, H, 1.0)
+            newton = numpy.linalg.solve(H, -g)
+            assert numpy.abs(h - newton).max() <= 1e-8 * numpy.abs(newton).max()
+
+    def test_scaled_hessian(self) -> None:
+        H = 1e-9 * numpy.array([[2.0, 1.0], [1.0, 3.0]])
+        g = numpy.array([1e-9, -2e-9])
+        h = solve(g, H, 10.0)
+        newton = numpy.linalg.solve(H, -g)
+        assert numpy.abs(h - newton).max() <= 1e-8 * numpy.abs(newton).max()
+        h = solve(g, H, 0.1)
+        assert abs(numpy.linalg.norm(h) - 0.1) < 1e-8
+        check_optimality(g / 1e-9, H / 1e-9, 0.1, h)
+
+
+if __name__ == "__main__":
+    Test_exact_trs().test_interior()
+    Test_exact_trs().test_boundary()
+    Test_exact_trs().test_indefinite()
+    Test_exact_trs().test_hard_case()
+    Test_exact_trs().test_flag()
+    Test_exact_trs().test_positive_definite_small_component()
+    Test_exact_trs().test_tiny_gradient()
+    Test_exact_trs().test_scaled_hessian()
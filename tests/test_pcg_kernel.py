@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import Tuple
+
+import numpy
+from optimizer._internals.pcg.flag import Flag
+from optimizer._internals.pcg.kernel import pcg_kernel
+from optimizer._internals.pcg.precondition import hessian_precon
+from overloads.typing import ndarray
+
+_eps = float(numpy.finfo(numpy.float64).eps)
+
+
+def reference(
+    g: ndarray,
+    H: ndarray,
+    R: ndarray,
+    constraints: Tuple[ndarray, ndarray, ndarray, ndarray],
+    delta: float,
+) -> Tuple[ndarray, int, Flag, float]:
+    """
+    编译内核之前的NumPy实现，额外返回决定退出的判据离临界值的相对距离
+    """
+    A, b, lb, ub = constraints
+    (n,) = g.shape
+    x = numpy.zeros((n,))
+    r = -g
+    z = r / R
+    d = z
+    inner1 = float(r @ z)
+    margin = math.inf
+    for iter in range(n):
+        if numpy.abs(z).max() < math.sqrt(_eps):
+            return x, iter, Flag.RESIDUAL_CONVERGENCE, margin
+        ww = H @ d
+        denom = float(d @ ww)
+        margin = min(margin, abs(denom) / max(float(d @ d), 1e-300))
+        if denom <= 0:
+            return x, iter, Flag.NEGATIVE_CURVATURE, margin
+        alpha = inner1 / denom
+        x_new = x + alpha * d
+        size = float(numpy.linalg.norm(x_new))
+        margin = min(margin, abs(size - delta) / delta)
+        if size > delta:
+            return x, iter, Flag.OUT_OF_TRUST_REGION, margin
+        slack = numpy.concatenate((x_new - lb, ub - x_new, b - A @ x_new))
+        slack = slack[numpy.isfinite(slack)]
+        if slack.shape[0]:
+            margin = min(margin, float(numpy.abs(slack).min()))
+        if not (numpy.all(lb <= x_new) and numpy.all(x_new <= ub)):
+            return x, iter, Flag.VIOLATE_CONSTRAINTS, margin
+        if not numpy.all(A @ x_new <= b):
+            return x, iter, Flag.VIOLATE_CONSTRAINTS, margin
+        x = x_new
+        r = r - alpha * ww
+        z = r / R
+        inner2 = inner1
+        inner1 = float(r @ z)
+        d = z + (inner1 / inner2) * d
+    return x, n - 1, Flag.RESIDUAL_CONVERGENCE, margin
+
+
+def random_problem(
+    rng: numpy.random.RandomState, n: int, m: int, finite: bool
+) -> Tuple[ndarray, ndarray, Tuple[ndarray, ndarray, ndarray, ndarray], float]:
+    M = rng.randn(n, n)
+    H = (M + M.T) / 2.0 + rng.rand() * n * numpy.eye(n)
+    g = rng.randn(n)
+    A = rng.randn(m, n)
+    b = rng.rand(m) * 2.0
+    if finite:
+        lb = -rng.rand(n) * 3.0
+        ub = rng.rand(n) * 3.0
+    else:
+        lb = numpy.full((n,), -numpy.inf)
+        ub = numpy.full((n,), numpy.inf)
+    delta = float(rng.rand() * 10.0)
+    return g, H, (A, b, lb, ub), delta
+
+
+class Test_pcg_kernel:
+    def test_against_reference(self) -> None:
+        rng = numpy.random.RandomState(0)
+        compared = 0
+        for k in range(1000):
+            n = rng.randint(1, 41)
+            m = rng.randint(0, 9)
+            g, H, constraints, delta = random_problem(rng, n, m, k % 2 == 0)
+            R = hessian_precon(H)
+            x_ref, iter_ref, flag_ref, margin = reference(g, H, R, constraints, delta)
+            # 判据落在舍入误差之内时，两种实现的分支可以合理地不同
+            if margin < 1e-9:
+                continue
+            compared += 1
+
+            A, b, lb, ub = constraints
+            x, _, r, iter, code = pcg_kernel(g, H, R, A, b, lb, ub, delta)
+            assert Flag(int(code)) == flag_ref
+            assert iter == iter_ref
+            scale = max(1.0, float(numpy.abs(x_ref).max()))
+            assert float(numpy.abs(x - x_ref).max()) <= 1e-8 * scale
+            # 残差满足 r == -g - H @ x
+            Hx = H @ x
+            assert float(numpy.abs(-(g + r) - Hx).max()) <= 1e-8 * max(
+                1.0, float(numpy.abs(Hx).max()), float(numpy.abs(g).max())
+            )
+        assert compared >= 900
+
+
+if __name__ == "__main__":
+    Test_pcg_kernel().test_against_reference()